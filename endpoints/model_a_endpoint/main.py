@@ -1,9 +1,12 @@
+import atexit
+import json
 import logging
 import os
+import queue
 from datetime import date
-from typing import Any, Dict
+from logging.handlers import QueueHandler, QueueListener
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from pydantic import BaseModel, Field
 
 try:
@@ -19,11 +22,33 @@ app = FastAPI(
     description="Age-focused car insurance pricing model",
 )
 
-logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("./logs/model-a.log"), logging.StreamHandler()],
-)
+
+def _setup_logging(filename: str) -> None:
+    """
+    Route log records through a queue so request handlers never block on
+    disk writes; a background listener thread does the actual output.
+    """
+
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    handlers = [logging.FileHandler(filename), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+    root.addHandler(QueueHandler(log_queue))
+
+
+# Only configure once so a re-import does not open another log file handle
+if not logging.getLogger().handlers:
+    _setup_logging("./logs/model-a.log")
 logger = logging.getLogger(__name__)
 
 
@@ -47,17 +72,37 @@ async def predict(request: PriceRequest):
         postal_code=request.postal_code,
     )
 
-    logger.info(f"Prediction generated: {result['price']} EUR")
+    logger.info("Prediction generated: %s EUR", result["price"])
     return result
 
 
+# Health and service info never change while the process runs, so they are
+# serialized once here instead of on every probe
+HEALTH_RESPONSE = json.dumps(
+    {"status": "healthy", "model": model.name, "version": "0.1.0"}
+).encode()
+ROOT_RESPONSE = json.dumps(
+    {
+        "service": "Model A API",
+        "description": "Age-based car insurance pricing model",
+        "version": "0.1.0",
+        "model_available": model.name,
+        "endpoints": {
+            "predict": "POST /predict",
+            "health": "GET /health",
+            "docs": "GET /docs",
+        },
+    }
+).encode()
+
+
 @app.get("/health")
-async def health():
-    return {"status": "healthy", "model": model.name, "version": "0.1.0"}
+async def health() -> Response:
+    return Response(content=HEALTH_RESPONSE, media_type="application/json")
 
 
 @app.get("/")
-async def root() -> Dict[str, Any]:
+async def root() -> Response:
     """
     Root endpoint with service information.
 
@@ -65,14 +110,4 @@ async def root() -> Dict[str, Any]:
         Service metadata and available endpoints
     """
 
-    return {
-        "service": "Model A API",
-        "description": "Age-based car insurance pricing model",
-        "version": "0.1.0",
-        "model_available": model.name,
-        "endpoints": {
-            "predict": "POST /predict",
-            "health": "GET /health",
-            "docs": "GET /docs",
-        },
-    }
+    return Response(content=ROOT_RESPONSE, media_type="application/json")
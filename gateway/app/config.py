@@ -5,6 +5,8 @@ This module handles loading and accessing configuration from environment
 variables and YAML files.
 """
 
+from typing import List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -17,6 +19,13 @@ class Settings(BaseSettings):
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
         gateway_host: Host address to bind the gateway
         gateway_port: Port number for the gateway
+        model_timeout_seconds: Timeout for calls to model services
+        http_max_connections: Connection pool size for model service calls
+        http_max_keepalive_connections: Idle keep-alive connections kept in the pool
+        cors_enabled: Install CORS middleware (disable for server-to-server use)
+        cors_allow_origins: Origins allowed by CORS when enabled
+        price_cache_maxsize: Maximum number of cached price responses (0 disables caching)
+        price_cache_ttl_seconds: Lifetime of a cached price (0 disables caching)
     """
 
     # Configuration paths
@@ -33,6 +42,18 @@ class Settings(BaseSettings):
     # Timeouts (seconds)
     model_timeout_seconds: int = 10
 
+    # Outbound HTTP connection pool (shared by all model calls)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+
+    # CORS
+    cors_enabled: bool = True
+    cors_allow_origins: List[str] = ["*"]
+
+    # Price cache (identical quotes are answered without calling the model)
+    price_cache_maxsize: int = 10_000
+    price_cache_ttl_seconds: int = 60
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -2,9 +2,47 @@
 Create logger instance.
 """
 
+import atexit
 import logging
 import os
-from typing import Optional
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+_queue_listeners: List[QueueListener] = []
+
+
+def make_queue_handler(*handlers: logging.Handler) -> QueueHandler:
+    """
+    Function for wrapping blocking handlers behind an in-memory queue.
+
+    Records are enqueued by the returned handler and written out by a
+    background `QueueListener` thread, so logging calls made from the event
+    loop never wait on disk I/O.
+
+    :arg handlers: Handlers doing the actual output (file, console, ...).
+    :return: Returns queue handler to attach to a logger
+    """
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _queue_listeners.append(listener)
+
+    return QueueHandler(log_queue)
+
+
+def stop_queue_listeners() -> None:
+    """
+    Function for flushing and stopping all listeners started by
+    `make_queue_handler`.
+    """
+
+    while _queue_listeners:
+        _queue_listeners.pop().stop()
+
+
+atexit.register(stop_queue_listeners)
 
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
@@ -20,16 +58,24 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
 
     os.makedirs(log_dir, exist_ok=True)
 
-    filename = os.path.join(log_dir, "logs.log")
+    # Configure the root logger only once, otherwise every call would open
+    # (and leak) another FileHandler
+    root = logging.getLogger()
+    if not root.handlers:
+        filename = os.path.join(log_dir, "logs.log")
 
-    logging.basicConfig(
-        level=log_level,
-        format="[%(asctime)s] %(name)s [%(levelname)s] %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[
+        formatter = logging.Formatter(
+            "[%(asctime)s] %(name)s [%(levelname)s] %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+        handlers = [
             logging.FileHandler(filename=filename, mode="a"),
             logging.StreamHandler(),
-        ],
-    )
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        root.setLevel(log_level)
+        root.addHandler(make_queue_handler(*handlers))
 
     return logging.getLogger(name if name is not None else __name__)
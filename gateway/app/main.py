@@ -5,19 +5,33 @@ This is the entry point for the gateway service that routes insurance
 pricing requests to different model versions.
 """
 
+import asyncio
+import itertools
+import secrets
 import time
-import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
 
 import httpx
-from fastapi import FastAPI, HTTPException, Request
+import orjson
+from cachetools import TTLCache
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.openapi.utils import (
+    validation_error_definition,
+    validation_error_response_definition,
+)
+from fastapi.responses import ORJSONResponse
 from prometheus_client import make_asgi_app
+from pydantic import ValidationError
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .config import settings
 from .models import (
+    PRICE_REQUEST_ADAPTER,
     ConfigResponse,
-    GatewayMetadata,
     HealthResponse,
     PriceRequest,
     PriceResponse,
@@ -25,6 +39,30 @@ from .models import (
 from .observability import setup_observability
 from .routing import RouterEngine
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Manage resources shared across requests.
+
+    A single pooled `httpx.AsyncClient` is used for all model calls so
+    keep-alive connections to the model services are reused instead of
+    opening a new connection per request.
+    """
+
+    app.state.http_client = httpx.AsyncClient(
+        timeout=settings.model_timeout_seconds,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+        ),
+    )
+    try:
+        yield
+    finally:
+        await app.state.http_client.aclose()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Ominimo Pricing Engine API Gateway",
@@ -32,17 +70,32 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 # Expose Prometheus metrics at /metrics
 app.mount("/metrics", make_asgi_app())
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Add CORS middleware (only needed when browsers call the gateway directly)
+if settings.cors_enabled:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_allow_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Model responses for identical quote requests, keyed by model + request fields
+PRICE_CACHE: TTLCache = TTLCache(
+    maxsize=max(settings.price_cache_maxsize, 0),
+    ttl=settings.price_cache_ttl_seconds,
+)
+# A zero size or TTL turns the cache off (TTLCache rejects writes at maxsize 0)
+PRICE_CACHE_ENABLED = (
+    settings.price_cache_maxsize > 0 and settings.price_cache_ttl_seconds > 0
 )
 
 # Initialize components
@@ -57,29 +110,173 @@ if ab.get("enabled") and ab.get("distributions"):
     observability.set_expected_distribution(expected)
 
 
-@app.middleware("http")
-async def add_request_id_and_timing(request: Request, call_next):
+# Request IDs are a random per-process prefix plus a counter: unique across
+# workers and replicas without reading os.urandom on every request
+REQUEST_ID_PREFIX = secrets.token_hex(6)
+_request_id_counter = itertools.count(1)
+
+# Paths served without request ID / timing headers (metrics scrapes, docs)
+UNTRACKED_PATH_PREFIXES = ("/metrics", "/docs", "/redoc", "/openapi.json")
+
+
+class RequestIDTimingMiddleware:
     """
-    Middleware to add request ID and measure processing time.
+    Pure ASGI middleware to add request ID and measure processing time.
 
-    Adds X-Request-ID header and X-Process-Time to all responses.
+    Adds X-Request-ID header and X-Process-Time to API responses. Written as
+    raw ASGI (rather than `@app.middleware("http")`) so responses are not
+    buffered through an extra task and memory channel per request.
+    Requests under `UNTRACKED_PATH_PREFIXES` are passed through untouched.
     """
 
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(UNTRACKED_PATH_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = f"{REQUEST_ID_PREFIX}-{next(_request_id_counter):x}"
+        scope.setdefault("state", {})["request_id"] = request_id
+        start_time = time.perf_counter()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_time = time.perf_counter() - start_time
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                headers.append("X-Process-Time", f"{process_time:.3f}")
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+app.add_middleware(RequestIDTimingMiddleware)
+
+
+async def _call_model(
+    client: httpx.AsyncClient,
+    request: PriceRequest,
+    request_id: str,
+    model_id: str,
+    model_config: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Call a model service's /predict endpoint and validate its answer.
+
+    Raises:
+        httpx.HTTPError: If the model service cannot be reached or errors
+        HTTPException: If the model returns an invalid schema
+    """
+
+    # Serialize the outbound body with pydantic-core rather than letting
+    # httpx json.dumps the payload dict a second time
+    body = request.model_dump_json().encode()
+
+    model_call_start = time.time()
+    try:
+        response = await client.post(
+            f"{model_config['url']}/predict", content=body, headers=JSON_HEADERS
+        )
+        response.raise_for_status()
+        # Decode the raw bytes directly, skipping httpx's text decoding step
+        result = orjson.loads(response.content)
+        observability.prom_record_model_call(
+            model_id, True, time.time() - model_call_start
+        )
+    except Exception:
+        observability.prom_record_model_call(
+            model_id, False, time.time() - model_call_start
+        )
+        raise
+
+    # Validate minimal schema from model
+    required_keys = {"model_name", "price", "breakdown"}
+    missing = required_keys - set(result)
+
+    if missing:
+        msg = f"Model {model_id} returned invalid schema, missing: {sorted(missing)}"
+        observability.log_error(request_id, "ModelSchemaError", msg, model_id)
+        raise HTTPException(status_code=502, detail=msg)
+
+    return result
+
+
+def _parse_price_request(body: bytes, content_type: Optional[str]) -> PriceRequest:
+    """
+    Validate a raw /price body straight from JSON bytes.
+
+    Like FastAPI's own body handling, a body sent with a non-JSON
+    Content-Type is rejected rather than parsed (a missing header is
+    treated as JSON).
 
-    response.headers["X-Request-ID"] = request_id
-    response.headers["X-Process-Time"] = f"{process_time:.3f}"
+    Raises:
+        RequestValidationError: If the body is not a valid PriceRequest, so
+        the client gets FastAPI's usual 422 response
+    """
+
+    if content_type:
+        media_type = content_type.partition(";")[0].strip().lower()
+        if media_type != "application/json" and not (
+            media_type.startswith("application/") and media_type.endswith("+json")
+        ):
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "model_attributes_type",
+                        "loc": ("body",),
+                        "msg": "Input should be a valid dictionary or object "
+                        "to extract fields from",
+                        "input": body.decode(errors="replace"),
+                    }
+                ],
+                body=body,
+            )
 
-    return response
+    try:
+        return PRICE_REQUEST_ADAPTER.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ],
+            body=body,
+        )
 
 
-@app.post("/price", response_model=PriceResponse, tags=["Pricing"])
-async def get_price(request: PriceRequest, req: Request):
+# Response schemas are declared via `responses=` so they are documented in
+# OpenAPI without FastAPI validating every outgoing payload against them. The
+# request body is parsed by `_parse_price_request`, so it is documented via
+# `openapi_extra` instead of a typed parameter (its schemas are registered in
+# `_openapi` below).
+@app.post(
+    "/price",
+    responses={
+        200: {"model": PriceResponse},
+        422: {
+            "description": "Validation Error",
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/HTTPValidationError"}
+                }
+            },
+        },
+    },
+    tags=["Pricing"],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/PriceRequest"}
+                }
+            },
+            "required": True,
+        }
+    },
+)
+async def get_price(req: Request, background_tasks: BackgroundTasks):
     """
     Get insurance price quote.
 
@@ -87,8 +284,8 @@ async def get_price(request: PriceRequest, req: Request):
     routing rules. Returns the calculated price with detailed breakdown.
 
     Args:
-        request: Price request with driver and car information
-        req: FastAPI request object (for metadata)
+        req: FastAPI request object carrying the PriceRequest JSON body
+        background_tasks: Tasks run after the response has been sent
 
     Returns:
         Price response with calculation details and routing metadata
@@ -101,26 +298,24 @@ async def get_price(request: PriceRequest, req: Request):
     model_id = None
     start_time = time.time()
 
-    # Convert request to dict for routing (ensure date strings)
-    payload = request.model_dump()
-    payload["birthdate"] = request.birthdate.isoformat()
-    payload["driver_license_date"] = request.driver_license_date.isoformat()
+    # Parse and validate the driver and car information
+    request = _parse_price_request(await req.body(), req.headers.get("content-type"))
+
+    # Convert request to dict for routing (JSON mode emits ISO date strings)
+    payload = request.model_dump(mode="json")
 
     # Log incoming request
     client_ip = req.client.host if req.client else None
     observability.log_request(request_id, payload, client_ip)
 
     try:
-        # Determine which model to use
-        model_id = router_engine.route_request(payload)
+        # Determine which model to use (plus its config and the active rule)
+        model_id, model_config, routing_rule = router_engine.resolve(payload)
         observability.log_exposure(
-            experiment_id=router_engine.config.get("ab_testing", {}).get(
-                "experiment_id", "api_routing_default"
-            ),
+            experiment_id=router_engine.get_experiment_id(),
             unit_id=payload.get("postal_code", "anon"),
             model_id=model_id,
         )
-        model_config = router_engine.get_model_config(model_id)
 
         # Check if model is enabled
         if not model_config.get("enabled", True):
@@ -129,55 +324,57 @@ async def get_price(request: PriceRequest, req: Request):
             )
 
         # Log routing decision
-        routing_rule = router_engine.get_routing_rule()
         observability.log_routing_decision(request_id, model_id, routing_rule, payload)
 
-        # Call the selected model
-        model_url = model_config["url"]
-
-        async with httpx.AsyncClient(timeout=settings.model_timeout_seconds) as client:
-            model_call_start = time.time()
-            try:
-                response = await client.post(f"{model_url}/predict", json=payload)
-                response.raise_for_status()
-                result = response.json()
-                observability.prom_record_model_call(
-                    model_id, True, time.time() - model_call_start
-                )
-            except Exception:
-                observability.prom_record_model_call(
-                    model_id, False, time.time() - model_call_start
-                )
-                raise
-
-        # Validate minimal schema from model
-        required_keys = {"price", "breakdown"}
-        missing = required_keys - set(result)
-
-        if missing:
-            msg = (
-                f"Model {model_id} returned invalid schema, missing: {sorted(missing)}"
+        # Serve repeated quotes from the cache, otherwise call the selected model
+        # (PriceRequest is frozen, so it hashes and compares by field values)
+        cache_key = (model_id, request)
+        result = PRICE_CACHE.get(cache_key)
+        cache_hit = result is not None
+
+        if not cache_hit:
+            result = await _call_model(
+                req.app.state.http_client, request, request_id, model_id, model_config
             )
-            observability.log_error(request_id, "ModelSchemaError", msg, model_id)
-            raise HTTPException(status_code=502, detail=msg)
+            if PRICE_CACHE_ENABLED:
+                PRICE_CACHE[cache_key] = result
 
         # Calculate total processing time
         process_time = time.time() - start_time
 
-        # Add gateway metadata
-        result["gateway_metadata"] = GatewayMetadata(
-            model_id=model_id,
-            model_version=model_config["version"],
-            routing_rule=routing_rule,
-            process_time_ms=round(process_time * 1000, 2),
-        ).model_dump()
-
-        # Log successful response
-        observability.log_model_response(
-            request_id, model_id, result.get("price", 0), process_time
+        # Add PriceResponse defaults and gateway metadata (on a copy, so the
+        # cached result stays untouched)
+        result = {
+            "currency": "EUR",
+            "metadata": {},
+            **result,
+            # Same shape as GatewayMetadata, built directly since every value
+            # comes from the gateway itself
+            "gateway_metadata": {
+                "model_id": model_id,
+                "model_version": model_config["version"],
+                "routing_rule": routing_rule,
+                "process_time_ms": round(process_time * 1000, 2),
+                "cache_hit": cache_hit,
+            },
+        }
+
+        # Log successful response once the client has its answer
+        background_tasks.add_task(
+            observability.log_model_response,
+            request_id,
+            model_id,
+            result.get("price", 0),
+            process_time,
         )
 
-        return PriceResponse(**result)
+        # The model response was schema-checked in _call_model, so it is sent
+        # as-is instead of being re-validated through PriceResponse
+        return ORJSONResponse(content=result)
+
+    except HTTPException:
+        # Already carries the intended status (503 disabled, 502 bad schema)
+        raise
 
     except httpx.HTTPError as e:
         error_msg = f"Error calling model service: {str(e)}"
@@ -192,8 +389,50 @@ async def get_price(request: PriceRequest, req: Request):
         raise HTTPException(status_code=500, detail=error_msg) from e
 
 
-@app.get("/health", response_model=HealthResponse, tags=["Health"])
-async def health_check():
+_default_openapi = app.openapi
+
+
+def _openapi() -> Dict[str, Any]:
+    """
+    Build the OpenAPI schema, registering the component schemas that /price
+    references from `openapi_extra` (FastAPI only adds those for typed body
+    parameters).
+    """
+
+    if app.openapi_schema:
+        return app.openapi_schema
+
+    schema = _default_openapi()
+    components = schema.setdefault("components", {}).setdefault("schemas", {})
+    request_schema = PriceRequest.model_json_schema(
+        ref_template="#/components/schemas/{model}"
+    )
+    components.update(request_schema.pop("$defs", {}))
+    components["PriceRequest"] = request_schema
+    components.setdefault("ValidationError", validation_error_definition)
+    components.setdefault("HTTPValidationError", validation_error_response_definition)
+    return schema
+
+
+app.openapi = _openapi
+
+
+async def _probe_model_health(
+    client: httpx.AsyncClient, config: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Fetch a single model's /health, reporting failures as unreachable."""
+
+    try:
+        response = await client.get(
+            f"{config['url']}/health", timeout=httpx.Timeout(5.0)
+        )
+        return response.json()
+    except Exception as e:
+        return {"status": "unreachable", "error": str(e)}
+
+
+@app.get("/health", responses={200: {"model": HealthResponse}}, tags=["Health"])
+async def health_check(req: Request):
     """
     Check health of gateway and all model services.
 
@@ -201,20 +440,19 @@ async def health_check():
         Health status of gateway and all configured models
     """
 
-    model_health = {}
+    client: httpx.AsyncClient = req.app.state.http_client
+    models = router_engine.get_all_models()
 
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        for model_id, config in router_engine.get_all_models().items():
-            try:
-                response = await client.get(f"{config['url']}/health")
-                model_health[model_id] = response.json()
-            except Exception as e:
-                model_health[model_id] = {"status": "unreachable", "error": str(e)}
+    # Probe all models concurrently so /health takes max(RTT) instead of sum
+    results = await asyncio.gather(
+        *(_probe_model_health(client, config) for config in models.values())
+    )
+    model_health = dict(zip(models, results))
 
-    return HealthResponse(gateway="healthy", models=model_health)
+    return {"gateway": "healthy", "models": model_health}
 
 
-@app.get("/config", response_model=ConfigResponse, tags=["Configuration"])
+@app.get("/config", responses={200: {"model": ConfigResponse}}, tags=["Configuration"])
 async def get_config():
     """
     View current routing configuration.
@@ -222,11 +460,11 @@ async def get_config():
     Returns:
         Current configuration including models, routing rules, and A/B testing setup
     """
-    return ConfigResponse(
-        models=router_engine.config["models"],
-        routing_rules=router_engine.config["routing_rules"],
-        ab_testing=router_engine.config.get("ab_testing", {}),
-    )
+    return {
+        "models": router_engine.config["models"],
+        "routing_rules": router_engine.config["routing_rules"],
+        "ab_testing": router_engine.config.get("ab_testing", {}),
+    }
 
 
 @app.post("/config/reload", tags=["Configuration"])
@@ -241,6 +479,8 @@ async def reload_config():
     """
     try:
         router_engine.reload_config()
+        # Model URLs/versions may have changed, cached prices no longer apply
+        PRICE_CACHE.clear()
         return {
             "message": "Configuration reloaded successfully",
             "routing_rule": router_engine.get_routing_rule(),
@@ -251,6 +491,19 @@ async def reload_config():
         ) from e
 
 
+@app.post("/cache/clear", tags=["Configuration"])
+async def clear_price_cache():
+    """
+    Drop all cached price responses.
+
+    Returns:
+        Success message with the number of entries removed
+    """
+    cleared = len(PRICE_CACHE)
+    PRICE_CACHE.clear()
+    return {"message": "Price cache cleared", "entries_cleared": cleared}
+
+
 @app.get("/", tags=["Info"])
 async def root():
     """
@@ -282,7 +535,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     request_id = getattr(request.state, "request_id", "unknown")
     observability.log_error(request_id, type(exc).__name__, str(exc))
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
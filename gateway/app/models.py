@@ -5,10 +5,95 @@ This module defines the data structures used for API requests and responses,
 including validation rules.
 """
 
+import time
 from datetime import date
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Annotated, Any, Dict, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, TypeAdapter
+
+
+@lru_cache(maxsize=1)
+def _today_for_minute(minute: int) -> date:
+    """Return the local date, computed once per wall-clock minute."""
+    return date.today()
+
+
+def _today() -> date:
+    """
+    Return today's date without calling `date.today()` on every validation.
+
+    Buckets are whole minutes of wall-clock time. Local midnight always falls
+    on a minute boundary, so a cached date never goes stale.
+    """
+    return _today_for_minute(int(time.time()) // 60)
+
+
+def _age_on(born: date, today: date) -> int:
+    """Return the age in whole years of someone born on `born`, as of `today`."""
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def _validate_birthdate(v: date) -> date:
+    """
+    Validate `birthdate`.
+
+    Ensures that:
+    - The driver is at least 18 years old.
+    - The driver's age does not exceed 100 years.
+    - The birthdate is not in the future.
+
+    Raises
+    ------
+    ValueError
+        If any of the above conditions are violated.
+    """
+
+    today = _today()
+    age = _age_on(v, today)
+
+    if age < 18:
+        raise ValueError("Driver must be at least 18 years old")
+    if age > 100:
+        raise ValueError("Invalid birthdate: age exceeds 100 years")
+    if v > today:
+        raise ValueError("Birthdate cannot be in the future")
+
+    return v
+
+
+def _validate_license_date(v: date) -> date:
+    """
+    Validate `driver_license_date`.
+
+    Ensures that:
+    - The license issue date is not in the future.
+
+    Raises
+    ------
+    ValueError
+        If the date is after today's date.
+    """
+
+    if v > _today():
+        raise ValueError("Driver license date cannot be in the future")
+    return v
+
+
+# Date types carrying their validation rules, checked after the date is parsed
+BirthDate = Annotated[date, AfterValidator(_validate_birthdate)]
+LicenseDate = Annotated[date, AfterValidator(_validate_license_date)]
+
+
+_PRICE_REQUEST_EXAMPLE = {
+    "example": {
+        "birthdate": "1995-06-15",
+        "driver_license_date": "2015-08-20",
+        "car_model": "Golf",
+        "car_brand": "Volkswagen",
+        "postal_code": "1234AC",
+    }
+}
 
 
 class PriceRequest(BaseModel):
@@ -60,13 +145,13 @@ class PriceRequest(BaseModel):
     ```
     """
 
-    birthdate: date = Field(
+    birthdate: BirthDate = Field(
         ...,
         description="Driver's birth date in YYYY-MM-DD format",
         examples=["1995-06-15"],
     )
 
-    driver_license_date: date = Field(
+    driver_license_date: LicenseDate = Field(
         ...,
         description="Date when driver's license was issued",
         examples=["2015-08-20"],
@@ -96,66 +181,18 @@ class PriceRequest(BaseModel):
         examples=["1234AC", "5678BD"],
     )
 
-    @field_validator("birthdate")
-    @classmethod
-    def validate_birthdate(cls, v: date) -> date:
-        """
-        Validate `birthdate`.
-
-        Ensures that:
-        - The driver is at least 18 years old.
-        - The driver's age does not exceed 100 years.
-        - The birthdate is not in the future.
-
-        Raises
-        ------
-        ValueError
-            If any of the above conditions are violated.
-        """
-
-        today = date.today()
-        age = today.year - v.year - ((today.month, today.day) < (v.month, v.day))
-
-        if age < 18:
-            raise ValueError("Driver must be at least 18 years old")
-        if age > 100:
-            raise ValueError("Invalid birthdate: age exceeds 100 years")
-        if v > today:
-            raise ValueError("Birthdate cannot be in the future")
-
-        return v
-
-    @field_validator("driver_license_date")
-    @classmethod
-    def validate_license_date(cls, v: date) -> date:
-        """
-        Validate `driver_license_date`.
-
-        Ensures that:
-        - The license issue date is not in the future.
-
-        Raises
-        ------
-        ValueError
-            If the date is after today's date.
-        """
-
-        if v > date.today():
-            raise ValueError("Driver license date cannot be in the future")
-        return v
-
-    class Config:
-        """Pydantic model configuration and schema examples."""
-
-        json_schema_extra = {
-            "example": {
-                "birthdate": "1995-06-15",
-                "driver_license_date": "2015-08-20",
-                "car_model": "Golf",
-                "car_brand": "Volkswagen",
-                "postal_code": "1234AC",
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra=_PRICE_REQUEST_EXAMPLE)
+
+
+_GATEWAY_METADATA_EXAMPLE = {
+    "example": {
+        "model_id": "model-b",
+        "model_version": "v0.1.0",
+        "routing_rule": "ab_testing_percentage",
+        "process_time_ms": 87.23,
+        "cache_hit": False,
+    }
+}
 
 
 class GatewayMetadata(BaseModel):
@@ -176,6 +213,9 @@ class GatewayMetadata(BaseModel):
     process_time_ms : float | None
         End-to-end processing time measured by the gateway in **milliseconds**
         (includes routing + downstream call). Optional.
+    cache_hit : bool
+        Whether the price was served from the gateway's price cache instead
+        of calling the model service.
     """
 
     model_id: str = Field(
@@ -198,18 +238,38 @@ class GatewayMetadata(BaseModel):
         description="Total gateway processing time in milliseconds.",
         examples=[123.45],
     )
+    cache_hit: bool = Field(
+        False,
+        description="True if the price was served from the gateway cache.",
+        examples=[False],
+    )
 
-    class Config:
-        """Pydantic configuration and example for OpenAPI."""
-
-        json_schema_extra = {
-            "example": {
-                "model_id": "model-b",
-                "model_version": "v0.1.0",
-                "routing_rule": "ab_testing_percentage",
-                "process_time_ms": 87.23,
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra=_GATEWAY_METADATA_EXAMPLE)
+
+
+_PRICE_RESPONSE_EXAMPLE = {
+    "example": {
+        "model_name": "Model B - Experience Based Pricing",
+        "price": 1234.56,
+        "currency": "EUR",
+        "breakdown": {
+            "base": 900.0,
+            "experience_factor": 1.2,
+            "risk_load": 120.0,
+        },
+        "metadata": {
+            "engine": "B",
+            "features_used": ["age", "experience", "brand"],
+        },
+        "gateway_metadata": {
+            "model_id": "model-b",
+            "model_version": "v0.1.0",
+            "routing_rule": "ab_testing_percentage",
+            "process_time_ms": 87.23,
+            "cache_hit": False,
+        },
+    }
+}
 
 
 class PriceResponse(BaseModel):
@@ -265,31 +325,18 @@ class PriceResponse(BaseModel):
         description="Routing/timing metadata added by the API Gateway.",
     )
 
-    class Config:
-        """Pydantic configuration and example for OpenAPI."""
-
-        json_schema_extra = {
-            "example": {
-                "model_name": "Model B - Experience Based Pricing",
-                "price": 1234.56,
-                "currency": "EUR",
-                "breakdown": {
-                    "base": 900.0,
-                    "experience_factor": 1.2,
-                    "risk_load": 120.0,
-                },
-                "metadata": {
-                    "engine": "B",
-                    "features_used": ["age", "experience", "brand"],
-                },
-                "gateway_metadata": {
-                    "model_id": "model-b",
-                    "model_version": "v0.1.0",
-                    "routing_rule": "ab_testing_percentage",
-                    "process_time_ms": 87.23,
-                },
-            }
-        }
+    model_config = ConfigDict(json_schema_extra=_PRICE_RESPONSE_EXAMPLE)
+
+
+_HEALTH_RESPONSE_EXAMPLE = {
+    "example": {
+        "gateway": "healthy",
+        "models": {
+            "model-a": {"status": "healthy"},
+            "model-b": {"status": "unreachable", "error": "Connection refused"},
+        },
+    }
+}
 
 
 class HealthResponse(BaseModel):
@@ -325,16 +372,38 @@ class HealthResponse(BaseModel):
         ],
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "gateway": "healthy",
-                "models": {
-                    "model-a": {"status": "healthy"},
-                    "model-b": {"status": "unreachable", "error": "Connection refused"},
-                },
+    model_config = ConfigDict(frozen=True, json_schema_extra=_HEALTH_RESPONSE_EXAMPLE)
+
+
+_CONFIG_RESPONSE_EXAMPLE = {
+    "example": {
+        "models": {
+            "model-a": {
+                "url": "http://model-a-api:8000",
+                "version": "v0.1.0",
+                "enabled": True,
             }
-        }
+        },
+        "routing_rules": {
+            "default": "ab_testing_percentage",
+            "available_rules": [
+                "birthdate_even_odd",
+                "postal_code_region",
+                "ab_testing_percentage",
+            ],
+        },
+        "ab_testing": {
+            "enabled": True,
+            "experiment_id": "api_routing_2025_10",
+            "unit_field": "postal_code",
+            "distributions": {
+                "model-a": 0.33,
+                "model-b": 0.33,
+                "model-c": 0.34,
+            },
+        },
+    }
+}
 
 
 class ConfigResponse(BaseModel):
@@ -390,36 +459,16 @@ class ConfigResponse(BaseModel):
         ],
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "models": {
-                    "model-a": {
-                        "url": "http://model-a-api:8000",
-                        "version": "v0.1.0",
-                        "enabled": True,
-                    }
-                },
-                "routing_rules": {
-                    "default": "ab_testing_percentage",
-                    "available_rules": [
-                        "birthdate_even_odd",
-                        "postal_code_region",
-                        "ab_testing_percentage",
-                    ],
-                },
-                "ab_testing": {
-                    "enabled": True,
-                    "experiment_id": "api_routing_2025_10",
-                    "unit_field": "postal_code",
-                    "distributions": {
-                        "model-a": 0.33,
-                        "model-b": 0.33,
-                        "model-c": 0.34,
-                    },
-                },
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra=_CONFIG_RESPONSE_EXAMPLE)
+
+
+_ERROR_RESPONSE_EXAMPLE = {
+    "example": {
+        "error": "HTTPError",
+        "detail": "Model service returned status 502 Bad Gateway.",
+        "model_id": "model-b",
+    }
+}
 
 
 class ErrorResponse(BaseModel):
@@ -455,11 +504,9 @@ class ErrorResponse(BaseModel):
         examples=["model-b"],
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "error": "HTTPError",
-                "detail": "Model service returned status 502 Bad Gateway.",
-                "model_id": "model-b",
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra=_ERROR_RESPONSE_EXAMPLE)
+
+
+# Built once at import so /price can validate raw JSON bodies in a single
+# pydantic-core pass
+PRICE_REQUEST_ADAPTER: TypeAdapter[PriceRequest] = TypeAdapter(PriceRequest)
@@ -7,13 +7,20 @@ and system health.
 
 import logging
 import time
-from collections import Counter as LocalCounter
+from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, DefaultDict, Dict, Optional, Tuple
 
 from prometheus_client import Counter, Histogram
 
-from .logger import get_logger
+from .logger import get_logger, make_queue_handler
+
+# Loggers already configured by ObservabilityManager, keyed by (name, log_dir)
+_LOGGER_CACHE: Dict[Tuple[str, str], logging.Logger] = {}
+
+# Rough chi-square thresholds for p<0.05 by k (df = k-1)
+# k=2 -> 3.84; k=3 -> 5.99; k=4 -> 7.81 (approx)
+_SRM_THRESHOLDS = {2: 3.84, 3: 5.99, 4: 7.81, 5: 9.49}
 
 
 class ObservabilityManager:
@@ -33,7 +40,8 @@ class ObservabilityManager:
         """
 
         self.log_dir = Path(log_dir)
-        self.log_dir.mkdir(parents=True, exist_ok=True)
+        if not self.log_dir.is_dir():
+            self.log_dir.mkdir(parents=True, exist_ok=True)
 
         # Setup loggers
         self.gateway_logger = self._setup_logger("gateway", log_level)
@@ -41,13 +49,24 @@ class ObservabilityManager:
         self.metrics_logger = self._setup_logger("metrics", log_level)
 
         # --- Exposure/SRM state ---
-        # exposure counts are kept per experiment+model (e.g., "exp:api...|model:model-a")
-        self._exposures: LocalCounter[str] = LocalCounter()
-        self._last_srm_log_ts: float = 0.0
+        # exposure counts are kept per experiment, then per model
+        # (e.g., {"api_routing_default": {"model-a": 12, ...}})
+        self._exposures: DefaultDict[str, DefaultDict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self._last_srm_log_ts: float = float("-inf")  # time.monotonic() of last check
         self._srm_log_interval_sec: int = 60  # throttle SRM logs
+        self._srm_min_exposures: int = 50  # exposures between clock reads
+        self._exposures_since_srm: int = 0
         self._expected_distribution: Optional[Dict[str, float]] = (
             None  # model_id -> weight in [0,1]
         )
+        # Same distribution unpacked once for the chi-square loop
+        self._exp_models: Tuple[str, ...] = ()
+        self._exp_probs: Tuple[float, ...] = ()
+        self._exp_k: int = 0  # number of models with a non-zero share
+        self._srm_df: int = 1
+        self._srm_threshold: float = _SRM_THRESHOLDS[2]
 
         # --- Prometheus metrics ---
         # Per-model request/latency/error
@@ -68,6 +87,9 @@ class ObservabilityManager:
             "Experiment exposures by model",
             ["experiment", "model"],
         )
+        # Label-bound children, resolved once per label set
+        self._model_metric_children: Dict[str, Tuple[Any, Any, Any]] = {}
+        self._exposure_children: Dict[Tuple[str, str], Any] = {}
 
     def set_expected_distribution(self, expected: Dict[str, float]) -> None:
         """
@@ -81,20 +103,37 @@ class ObservabilityManager:
         if total <= 0:
             # disable if invalid
             self._expected_distribution = None
+            self._exp_models, self._exp_probs, self._exp_k = (), (), 0
             self.routing_logger.warning("SRM disabled: expected distribution sum <= 0")
             return
         # normalize to sum=1
         self._expected_distribution = {m: float(w) / total for m, w in expected.items()}
+        self._exp_models = tuple(self._expected_distribution)
+        self._exp_probs = tuple(self._expected_distribution.values())
+        self._exp_k = sum(1 for p in self._exp_probs if p > 0)
+        self._srm_df = max(1, self._exp_k - 1)
+        self._srm_threshold = _SRM_THRESHOLDS.get(
+            self._exp_k, 3.84 + 2.0 * (self._srm_df - 1)
+        )  # crude growth for larger k
         self.routing_logger.info(
-            f"SRM expected distribution set: {self._expected_distribution}"
+            "SRM expected distribution set: %s", self._expected_distribution
         )
 
     def _setup_logger(self, name: str, level: str) -> logging.Logger:
         """
         Set up a logger with file and console handlers.
+
+        Loggers are cached per (name, log_dir), so later managers reuse the
+        handlers instead of opening the log files again.
         """
 
+        cache_key = (name, str(self.log_dir))
+        cached = _LOGGER_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
         logger = get_logger(name)
+        _LOGGER_CACHE[cache_key] = logger
 
         # Avoid duplicate handlers
         if logger.handlers:
@@ -115,8 +154,8 @@ class ObservabilityManager:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
 
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        # Writes happen on a background listener thread, off the event loop
+        logger.addHandler(make_queue_handler(file_handler, console_handler))
 
         return logger
 
@@ -132,10 +171,16 @@ class ObservabilityManager:
             client_ip: Client IP address
         """
 
+        if not self.gateway_logger.isEnabledFor(logging.INFO):
+            return
+
         self.gateway_logger.info(
-            f"Request {request_id} received from {client_ip or 'unknown'}: "
-            f"birthdate={payload.get('birthdate')}, "
-            f"car={payload.get('car_brand')} {payload.get('car_model')}"
+            "Request %s received from %s: birthdate=%s, car=%s %s",
+            request_id,
+            client_ip or "unknown",
+            payload.get("birthdate"),
+            payload.get("car_brand"),
+            payload.get("car_model"),
         )
 
     def log_routing_decision(
@@ -151,10 +196,15 @@ class ObservabilityManager:
             payload: Request payload
         """
 
+        if not self.routing_logger.isEnabledFor(logging.INFO):
+            return
+
         self.routing_logger.info(
-            f"Request {request_id} routed to {model_id} "
-            f"using rule '{routing_rule}' "
-            f"(postal_code={payload.get('postal_code')})"
+            "Request %s routed to %s using rule '%s' (postal_code=%s)",
+            request_id,
+            model_id,
+            routing_rule,
+            payload.get("postal_code"),
         )
 
     def log_exposure(self, experiment_id: str, unit_id: str, model_id: str) -> None:
@@ -170,12 +220,11 @@ class ObservabilityManager:
 
         # Structured exposure line for later parsing
         self.metrics_logger.info(
-            f"exposure experiment={experiment_id} unit={unit_id} model={model_id}"
+            "exposure experiment=%s unit=%s model=%s", experiment_id, unit_id, model_id
         )
 
         # Count exposure for SRM aggregation
-        key = f"exp:{experiment_id}|model:{model_id}"
-        self._exposures[key] += 1
+        self._exposures[experiment_id][model_id] += 1
 
         # Periodically emit SRM diagnostics
         self._maybe_log_srm(experiment_id)
@@ -193,59 +242,68 @@ class ObservabilityManager:
             - Only logs if we have >= 50 exposures for the experiment (avoid noise).
             - df = k-1 (k = number of models present in counts ∩ expected)
               We warn at p < 0.05 approx thresholds.
+            - Results that are not suspicious are logged at DEBUG only.
+            - Runs at most once per `_srm_log_interval_sec`, and the clock is
+              only read every `_srm_min_exposures` exposures.
         """
 
         if not self._expected_distribution:
             return
 
-        now = time.time()
+        # Only read the clock every `_srm_min_exposures` exposures
+        self._exposures_since_srm += 1
+        if self._exposures_since_srm < self._srm_min_exposures:
+            return
+        self._exposures_since_srm = 0
+
+        now = time.monotonic()
         if now - self._last_srm_log_ts < self._srm_log_interval_sec:
             return
         self._last_srm_log_ts = now
 
         # Aggregate counts for this experiment
-        counts: Dict[str, int] = {}
-        total = 0
-        prefix = f"exp:{experiment_id}|model:"
-        for key, c in self._exposures.items():
-            if key.startswith(prefix):
-                model = key.split("|model:")[1]
-                counts[model] = counts.get(model, 0) + c
-                total += c
+        counts = self._exposures.get(experiment_id, {})
+        total = sum(counts.values())
 
         if total < 50:
             return  # wait for a bit more data
 
-        # Restrict to models we have expectations for
-        observed = {m: counts.get(m, 0) for m in self._expected_distribution.keys()}
-        k = sum(1 for m in observed if self._expected_distribution.get(m, 0) > 0)
+        k = self._exp_k
         if k < 2:
             return  # not meaningful
 
+        # Restrict to models we have expectations for
+        observed = {m: counts.get(m, 0) for m in self._exp_models}
+
         # Chi-square statistic
         chi2 = 0.0
-        for m, obs in observed.items():
-            p = self._expected_distribution.get(m, 0.0)
-            exp = total * p
-            if exp > 0:
-                chi2 += (obs - exp) ** 2 / exp
-
-        # Rough threshold for p<0.05 by k (df = k-1)
-        # k=2 -> 3.84; k=3 -> 5.99; k=4 -> 7.81 (approx)
-        thresholds = {2: 3.84, 3: 5.99, 4: 7.81, 5: 9.49}
-        df = max(1, k - 1)
-        threshold = thresholds.get(
-            k, 3.84 + 2.0 * (df - 1)
-        )  # crude growth for larger k
+        for m, p in zip(self._exp_models, self._exp_probs):
+            if p > 0:
+                exp = total * p
+                chi2 += (observed[m] - exp) ** 2 / exp
+
+        threshold = self._srm_threshold
         suspicious = chi2 > threshold
+        if not suspicious and not self.routing_logger.isEnabledFor(logging.DEBUG):
+            return
 
-        self.routing_logger.info(
-            f"SRM exp={experiment_id} total={total} counts={observed} "
-            f"expected={self._expected_distribution} chi2={chi2:.2f} df={df} suspicious={suspicious}"
+        self.routing_logger.log(
+            logging.INFO if suspicious else logging.DEBUG,
+            "SRM exp=%s total=%d counts=%s expected=%s chi2=%.2f df=%d suspicious=%s",
+            experiment_id,
+            total,
+            observed,
+            self._expected_distribution,
+            chi2,
+            self._srm_df,
+            suspicious,
         )
         if suspicious:
             self.routing_logger.warning(
-                f"SRM suspected for exp={experiment_id}: chi2={chi2:.2f} > {threshold:.2f}"
+                "SRM suspected for exp=%s: chi2=%.2f > %.2f",
+                experiment_id,
+                chi2,
+                threshold,
             )
 
     def log_model_response(
@@ -262,13 +320,19 @@ class ObservabilityManager:
         """
 
         self.gateway_logger.info(
-            f"Request {request_id} completed by {model_id}: "
-            f"price={price:.2f} EUR, time={processing_time:.3f}s"
+            "Request %s completed by %s: price=%.2f EUR, time=%.3fs",
+            request_id,
+            model_id,
+            price,
+            processing_time,
         )
 
         # Also log to metrics
         self.metrics_logger.info(
-            f"model={model_id}, price={price:.2f}, time_ms={processing_time * 1000:.2f}"
+            "model=%s, price=%.2f, time_ms=%.2f",
+            model_id,
+            price,
+            processing_time * 1000,
         )
 
     def log_error(
@@ -289,8 +353,11 @@ class ObservabilityManager:
         """
 
         self.gateway_logger.error(
-            f"Request {request_id} failed: {error_type} - {error_message} "
-            f"(model={model_id or 'gateway'})"
+            "Request %s failed: %s - %s (model=%s)",
+            request_id,
+            error_type,
+            error_message,
+            model_id or "gateway",
         )
 
     def get_metrics_summary(self) -> Dict[str, Any]:
@@ -314,15 +381,34 @@ class ObservabilityManager:
     ) -> None:
         """Record a single downstream model call into Prometheus."""
 
-        self._m_requests.labels(model=model_id).inc()
-        self._m_latency.labels(model=model_id).observe(latency_s)
+        requests, latency, errors = self._model_metrics(model_id)
+        requests.inc()
+        latency.observe(latency_s)
         if not success:
-            self._m_errors.labels(model=model_id).inc()
+            errors.inc()
 
     def prom_record_exposure(self, experiment_id: str, model_id: str) -> None:
         """Increment exposure counter for SRM/traffic distribution."""
 
-        self._m_exposures.labels(experiment=experiment_id, model=model_id).inc()
+        key = (experiment_id, model_id)
+        child = self._exposure_children.get(key)
+        if child is None:
+            child = self._m_exposures.labels(experiment=experiment_id, model=model_id)
+            self._exposure_children[key] = child
+        child.inc()
+
+    def _model_metrics(self, model_id: str) -> Tuple[Any, Any, Any]:
+        """Return the (requests, latency, errors) children bound to `model_id`."""
+
+        children = self._model_metric_children.get(model_id)
+        if children is None:
+            children = (
+                self._m_requests.labels(model=model_id),
+                self._m_latency.labels(model=model_id),
+                self._m_errors.labels(model=model_id),
+            )
+            self._model_metric_children[model_id] = children
+        return children
 
 
 # Global observability manager instance
@@ -5,14 +5,33 @@ This module implements different routing strategies including feature-based
 routing and A/B testing.
 """
 
+import copy
 import hashlib
 from bisect import bisect
+from collections import OrderedDict
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it, pure Python otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed config files keyed by resolved path, validated by (mtime_ns, size)
+_YAML_CACHE: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+_YAML_CACHE_MAXSIZE = 100
+
+# A/B buckets use 60 bits of SHA-256, i.e. r in [0, 1) with 2**60 steps
+_BUCKET_SCALE = float(1 << 60)
+
+# Number of unit ids whose A/B assignment is memoized per compiled config
+_AB_PICK_CACHE_SIZE = 16384
+
+# Model per leading postal code digit: 1-3 North, 4-6 Central, 7-9 South
+_POSTAL_REGION_MODELS = ("model-a",) * 4 + ("model-b",) * 3 + ("model-c",) * 3
+
 
 class RouterEngine:
     """
@@ -32,10 +51,15 @@ class RouterEngine:
 
         self.config_path = config_path
         self.config = self._load_config()
+        self._compile()
 
     def _load_config(self) -> Dict[str, Any]:
         """
         Load configuration from YAML file.
+
+        Parsed files are cached and reused while their mtime and size are
+        unchanged. Callers always get a deep copy, so the cached dict cannot
+        be mutated through `self.config`.
         """
 
         config_file = Path(self.config_path)
@@ -43,43 +67,167 @@ class RouterEngine:
         if not config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
 
+        key = str(config_file.resolve())
+        st = config_file.stat()
+        cached = _YAML_CACHE.get(key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            _YAML_CACHE.move_to_end(key)
+            return copy.deepcopy(cached[2])
+
         with open(config_file, "r") as f:
-            return yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
+
+        _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, config)
+        _YAML_CACHE.move_to_end(key)
+        if len(_YAML_CACHE) > _YAML_CACHE_MAXSIZE:
+            _YAML_CACHE.popitem(last=False)
+
+        return copy.deepcopy(config)
 
     def reload_config(self) -> None:
         """Reload configuration from file (useful for live updates)."""
         self.config = self._load_config()
+        self._compile()
 
-    def route_request(self, payload: Dict[str, Any]) -> str:
+    def _compile(self) -> None:
         """
-        Determine which model should handle the request.
+        Precompute routing state from the loaded configuration.
+
+        The config only changes in `__init__` and `reload_config`, so the
+        active rule, its strategy method and the A/B weights are resolved
+        here once instead of on every request.
+        """
+
+        # First enabled model, used as the fallback by every strategy
+        self._default_model_id = next(
+            (
+                model_id
+                for model_id, config in (self.config.get("models") or {}).items()
+                if config.get("enabled", True)
+            ),
+            None,
+        )
+
+        rule = (
+            self.config.get("routing_rules", {}).get("default") or "birthdate_even_odd"
+        )
+        strategies = {
+            "birthdate_even_odd": self._route_by_birthdate,
+            "postal_code_region": self._route_by_postal_code,
+            "ab_testing_percentage": self._route_by_ab_testing,
+        }
+        self._strategy = strategies.get(
+            rule, lambda _payload: self._get_default_model()
+        )
+        self._routing_rule = self.get_routing_rule()
+
+        self._compile_ab_config()
+
+    def _compile_ab_config(self) -> None:
+        """
+        Precompute A/B testing state: unit field, experiment and a normalized
+        CDF with its labels for bisect.
+
+        Variants pointing at a disabled or missing model keep their share of
+        the CDF but are mapped to the default model here, so assignments of
+        the enabled variants do not move and no per-request check is needed.
+        """
+
+        ab_cfg = self.config.get("ab_testing") or {}
+        self._ab_enabled = bool(ab_cfg.get("enabled", False))
+        self._ab_unit_field = ab_cfg.get("unit_field", "postal_code")
+        self._ab_experiment_id = ab_cfg.get("experiment_id", "api_routing_default")
+
+        if "variants" in ab_cfg:
+            items = [
+                (v["target"], float(v.get("weight", 0)))
+                for v in ab_cfg["variants"].values()
+            ]
+        else:
+            distributions = ab_cfg.get("distributions") or {}
+            items = [(model, float(w)) for model, w in distributions.items()]
+
+        # None when no model is enabled; _get_default_model raises per request
+        default_model = self._default_model_id
+
+        cdf, labels = [], []
+        total = sum(w for _, w in items)
+        if total > 0:
+            # Weights that already sum to exactly 1.0 (the usual config) are
+            # used as-is; w / 1.0 == w, so the CDF is bit-for-bit the same
+            normalized = total == 1.0
+            acc = 0.0
+            for label, w in items:
+                acc += w if normalized else w / total
+                cdf.append(acc)
+                labels.append(label if self.is_model_enabled(label) else default_model)
+        self._ab_cdf = tuple(cdf)
+        self._ab_labels = tuple(labels)
+        self._ab_pick = self._make_ab_picker(
+            self._ab_experiment_id, self._ab_cdf, self._ab_labels
+        )
+
+    @staticmethod
+    def _make_ab_picker(
+        experiment_id: str, cdf: Tuple[float, ...], labels: Tuple[Optional[str], ...]
+    ) -> Callable[[str], Optional[str]]:
+        """
+        Build the unit id -> label function for one compiled A/B config.
+
+        Assignments are deterministic, so results are memoized. A new picker
+        (with an empty cache) is built whenever the config is recompiled.
+        """
+
+        # Hash input is "<experiment_id>:<unit_id>"; the prefix is encoded once
+        prefix = f"{experiment_id}:".encode()
+
+        @lru_cache(maxsize=_AB_PICK_CACHE_SIZE)
+        def pick(unit_id: str) -> Optional[str]:
+            # Deterministic bucket in [0,1) from the top 60 bits of the digest
+            # (the same value as int(hexdigest[:15], 16) / 16**15, without hex)
+            digest = hashlib.sha256(prefix + unit_id.encode()).digest()
+            r = (int.from_bytes(digest[:8], "big") >> 4) / _BUCKET_SCALE
+
+            idx = bisect(cdf, r)
+            return labels[idx] if idx < len(labels) else labels[-1]
+
+        return pick
+
+    def resolve(self, payload: Dict[str, Any]) -> Tuple[str, Dict[str, Any], str]:
+        """
+        Route a request and look up everything the gateway needs in one call.
 
         Args:
             payload: Dictionary containing request data (birthdate, car info, etc.)
 
         Returns:
-            Model ID (e.g., "model-a") to route the request to
+            Tuple of (model ID, model configuration, active routing rule)
 
         Raises:
-            ValueError: If routing rule is invalid or no models are available
+            KeyError: If the selected model is not in the configuration
+            ValueError: If no models are available
         """
 
-        routing_rule = (
-            self.config.get("routing_rules", {}).get("default") or "birthdate_even_odd"
-        )
+        model_id = self._strategy(payload)
+        return model_id, self.get_model_config(model_id), self._routing_rule
 
-        # Apply the configured routing strategy
-        if routing_rule == "birthdate_even_odd":
-            return self._route_by_birthdate(payload)
+    def route_request(self, payload: Dict[str, Any]) -> str:
+        """
+        Determine which model should handle the request.
 
-        if routing_rule == "postal_code_region":
-            return self._route_by_postal_code(payload)
+        Args:
+            payload: Dictionary containing request data (birthdate, car info, etc.)
 
-        if routing_rule == "ab_testing_percentage":
-            return self._route_by_ab_testing(payload)
+        Returns:
+            Model ID (e.g., "model-a") to route the request to
 
-        # Fallback to first available model
-        return self._get_default_model()
+        Raises:
+            ValueError: If routing rule is invalid or no models are available
+        """
+
+        # Apply the configured routing strategy (bound once by _compile; an
+        # unknown rule falls back to the first available model)
+        return self._strategy(payload)
 
     def _route_by_birthdate(self, payload: Dict[str, Any]) -> str:
         """
@@ -90,6 +238,12 @@ class RouterEngine:
 
         birthdate_str = payload.get("birthdate")
 
+        # Fast path for ISO "YYYY-MM-DD" strings (already validated by
+        # PriceRequest): the day's parity is the parity of its last digit,
+        # and ord() keeps that parity since ord("0") is even
+        if isinstance(birthdate_str, str) and len(birthdate_str) == 10:
+            return "model-a" if ord(birthdate_str[9]) % 2 == 0 else "model-b"
+
         if isinstance(birthdate_str, str):
             birthdate = date.fromisoformat(birthdate_str)
         else:
@@ -112,20 +266,12 @@ class RouterEngine:
 
         postal_code = payload.get("postal_code", "")
 
-        # Extract numeric part
-        numeric_part = "".join(filter(str.isdigit, postal_code))
-
-        if not numeric_part:
-            return self._get_default_model()
-
-        first_digit = int(numeric_part[0])
+        # Stop at the first digit; there is no need to collect the rest
+        for ch in postal_code:
+            if ch.isdigit():
+                return _POSTAL_REGION_MODELS[int(ch)]
 
-        if first_digit <= 3:
-            return "model-a"
-        elif first_digit <= 6:
-            return "model-b"
-        else:
-            return "model-c"
+        return self._get_default_model()
 
     def _route_by_ab_testing(self, payload: Dict[str, Any]) -> str:
         """
@@ -137,60 +283,28 @@ class RouterEngine:
                 (variant indirection)
         """
 
-        ab_cfg = self.config.get("ab_testing") or {}
-        if not ab_cfg.get("enabled", False):
+        if not self._ab_enabled:
             return self._get_default_model()
 
-        # Determine unit id for stickiness
-        unit_field = ab_cfg.get("unit_field", "postal_code")
-        unit_id = str(payload.get(unit_field, "anonymous"))
-        experiment_id = ab_cfg.get("experiment_id", "api_routing_default")
-
-        # Build a CDF for weighted pick
-        if "variants" in ab_cfg:
-            items = [
-                (v["target"], float(v.get("weight", 0)))
-                for v in ab_cfg["variants"].values()
-            ]
-        else:
-            distributions = ab_cfg.get("distributions") or {}
-            items = [(model, float(w)) for model, w in distributions.items()]
-
-        # Normalize and guard against empty/zero weights
-        total = sum(w for _, w in items)
-        if total <= 0 or not items:
+        # Guard against empty/zero weights
+        if not self._ab_cdf:
             return self._get_default_model()
-        items = [(m, w / total) for m, w in items]
 
-        # Deterministic bucket in [0,1)
-        h = hashlib.sha256(f"{experiment_id}:{unit_id}".encode()).hexdigest()
-        r = int(h[:15], 16) / float(16**15)
+        # Determine unit id for stickiness
+        unit_id = str(payload.get(self._ab_unit_field, "anonymous"))
 
-        # CDF pick
-        cdf, labels = [], []
-        acc = 0.0
-        for label, w in items:
-            acc += w
-            cdf.append(acc)
-            labels.append(label)
-        idx = bisect(cdf, r)
-        choice = labels[idx] if idx < len(labels) else labels[-1]
-
-        # Extra sanity: if chosen model disabled/missing → fallback
-        if choice not in self.config.get("models", {}):
-            return self._get_default_model()
-        if not self.is_model_enabled(choice):
+        # CDF pick (weights and fallbacks are precomputed by _compile_ab_config)
+        choice = self._ab_pick(unit_id)
+        if choice is None:
             return self._get_default_model()
         return choice
 
     def _get_default_model(self) -> str:
         """Get the first enabled model as default fallback."""
 
-        for model_id, config in (self.config.get("models") or {}).items():
-            if config.get("enabled", True):
-                return model_id
-
-        raise ValueError("No enabled models found in configuration")
+        if self._default_model_id is None:
+            raise ValueError("No enabled models found in configuration")
+        return self._default_model_id
 
     def get_model_config(self, model_id: str) -> Dict[str, Any]:
         """
@@ -206,19 +320,19 @@ class RouterEngine:
             KeyError: If model ID is not found in configuration
         """
 
-        if model_id not in (self.config.get("models") or {}):
+        config = (self.config.get("models") or {}).get(model_id)
+        if config is None:
             raise KeyError(f"Model '{model_id}' not found in configuration")
 
-        return self.config["models"][model_id]
+        return config
 
     def is_model_enabled(self, model_id: str) -> bool:
         """Check if a model is enabled in the configuration."""
 
-        try:
-            config = self.get_model_config(model_id)
-            return config.get("enabled", True)
-        except KeyError:
+        config = (self.config.get("models") or {}).get(model_id)
+        if config is None:
             return False
+        return config.get("enabled", True)
 
     def get_all_models(self) -> Dict[str, Dict[str, Any]]:
         """Get configuration for all models."""
@@ -231,3 +345,8 @@ class RouterEngine:
         return (self.config.get("routing_rules", {}) or {}).get(
             "default", "birthdate_even_odd"
         )
+
+    def get_experiment_id(self) -> str:
+        """Get the A/B experiment id exposures are recorded under."""
+
+        return self._ab_experiment_id
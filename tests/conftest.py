@@ -26,14 +26,13 @@ def pytest_sessionfinish(session, exitstatus):
     if total <= 0 or not counts:
         return
 
-    def pct(m):
-        return 100.0 * counts.get(m, 0) / total
-
+    # One line per model actually seen, so new variants show up automatically
+    lines = "".join(
+        f"{m}: {c:4d} ({100.0 * c / total:5.1f}%)\n" for m, c in sorted(counts.items())
+    )
     session.config.pluginmanager.get_plugin("terminalreporter").write(
         "\n\nA/B Distribution (aggregated)\n"
         "--------------------------------\n"
         f"total: {total}\n"
-        f"model-a: {counts.get('model-a',0):4d} ({pct('model-a'):5.1f}%)\n"
-        f"model-b: {counts.get('model-b',0):4d} ({pct('model-b'):5.1f}%)\n"
-        f"model-c: {counts.get('model-c',0):4d} ({pct('model-c'):5.1f}%)\n\n"
+        f"{lines}\n"
     )
@@ -6,6 +6,7 @@ import sys
 
 import anyio
 import httpx
+import orjson
 
 HOST = os.environ.get("HOST", "http://localhost:8000")
 N = int(os.environ.get("N", "500"))
@@ -20,12 +21,12 @@ payload_template = {
 }
 
 
-async def one(client):
+async def one(client, postal_code):
     data = dict(payload_template)
-    data["postal_code"] = str(random.randint(10000, 99999))
+    data["postal_code"] = postal_code
     r = await client.post(f"{HOST}/price", json=data)
     r.raise_for_status()
-    j = r.json()
+    j = orjson.loads(r.content)
     model = j["gateway_metadata"]["model_id"]
     # header has X-Process-Time in seconds
     pt = float(r.headers.get("X-Process-Time", "0"))
@@ -35,16 +36,24 @@ async def one(client):
 async def main():
     counts = {}
     times = {}
-    async with httpx.AsyncClient(timeout=5.0) as client:
+    # Pool sized to the concurrency so connections are reused, not reopened
+    limits = httpx.Limits(
+        max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY
+    )
+    sem = anyio.Semaphore(CONCURRENCY)
+    # All unit ids are drawn up front, outside the timed request path
+    codes = [str(c) for c in random.choices(range(10000, 100000), k=N)]
+    async with httpx.AsyncClient(timeout=5.0, limits=limits) as client:
 
-        async def worker(_):
-            m, t = await one(client)
+        async def worker(i):
+            async with sem:
+                m, t = await one(client, codes[i])
             counts[m] = counts.get(m, 0) + 1
             times.setdefault(m, []).append(t)
 
         async with anyio.create_task_group() as tg:
             for i in range(N):
-                await tg.spawn(worker, i)
+                tg.start_soon(worker, i)
 
     total = sum(counts.values())
     print(f"Total: {total}")
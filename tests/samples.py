@@ -0,0 +1,22 @@
+"""
+Shared loader for `tests/sample_payloads.json`.
+
+Used by both the pytest suite and the `GatewayTester` script, so the file is
+read and parsed only once per process.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+
+import orjson
+
+SAMPLES_PATH = os.environ.get("SAMPLES", "tests/sample_payloads.json")
+
+
+@lru_cache(maxsize=1)
+def load_samples(path: str = SAMPLES_PATH) -> Dict[str, Any]:
+    """Return the sample payloads, keyed by name."""
+
+    return orjson.loads(Path(path).read_bytes())
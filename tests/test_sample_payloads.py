@@ -1,11 +1,13 @@
-import json
 import os
+import random
+from collections import Counter
 
+import anyio
 import httpx
 import pytest
+from samples import load_samples
 
 HOST = os.environ.get("HOST", "http://localhost:8000")
-SAMPLES_PATH = os.environ.get("SAMPLES", "tests/sample_payloads.json")
 
 
 @pytest.fixture(scope="session")
@@ -15,8 +17,13 @@ def client():
 
 @pytest.fixture(scope="session")
 def samples():
-    with open(SAMPLES_PATH, "r") as f:
-        return json.load(f)
+    return load_samples()
+
+
+@pytest.fixture
+def anyio_backend():
+    # Async tests run on asyncio only (the gateway's own event loop)
+    return "asyncio"
 
 
 @pytest.fixture(scope="session")
@@ -86,11 +93,15 @@ def test_birthdate_even_odd_rule_if_enabled(
         assert m_odd == "model-b", f"Expected odd → model-b, got {m_odd}"
 
 
-def test_ab_distribution_if_enabled(client, samples, routing_mode, request):
+@pytest.mark.anyio
+async def test_ab_distribution_if_enabled(client, samples, routing_mode, request):
     """
     If 'ab_testing_percentage' is active, send many requests with RANDOM unit_ids
     (postal_code) so we sample the full hash space and approximate the configured
     distribution (33/33/34). Also verify stickiness for a few fixed unit_ids.
+
+    The random requests are sent concurrently (bounded by a semaphore), so the
+    test takes a few round trips instead of one per request.
     """
 
     if routing_mode != "ab_testing_percentage":
@@ -98,11 +109,9 @@ def test_ab_distribution_if_enabled(client, samples, routing_mode, request):
             "A/B distribution check skipped: routing rule is not ab_testing_percentage"
         )
 
-    import random
-    from collections import Counter
-
     # 1) Distribution check with random unit_ids (broad sampling)
     N = 600  # decent sample size
+    CONCURRENCY = 10  # stays below the gateway's keep-alive pool (20)
     counts = Counter()
 
     base_payload = {
@@ -112,14 +121,23 @@ def test_ab_distribution_if_enabled(client, samples, routing_mode, request):
         "car_brand": "Toyota",
     }
 
-    for _ in range(N):
-        pc = str(random.randint(10000, 99999))  # random unit_id each time
-        payload = dict(base_payload, postal_code=pc)
-        r = client.post("/price", json=payload)
-        assert r.status_code == 200, f"Random ab request failed: {r.text}"
-        model = (r.json().get("gateway_metadata") or {}).get("model_id")
-        assert model in {"model-a", "model-b", "model-c"}
-        counts[model] += 1
+    sem = anyio.Semaphore(CONCURRENCY)
+    limits = httpx.Limits(max_connections=CONCURRENCY)
+    async with httpx.AsyncClient(base_url=HOST, timeout=10.0, limits=limits) as aclient:
+
+        async def one(pc):
+            payload = dict(base_payload, postal_code=pc)
+            async with sem:
+                r = await aclient.post("/price", json=payload)
+            assert r.status_code == 200, f"Random ab request failed: {r.text}"
+            model = (r.json().get("gateway_metadata") or {}).get("model_id")
+            assert model in {"model-a", "model-b", "model-c"}
+            counts[model] += 1
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(N):
+                # random unit_id each time
+                tg.start_soon(one, str(random.randint(10000, 99999)))
 
     total = sum(counts.values())
     shares = {m: counts[m] / total for m in ("model-a", "model-b", "model-c")}
@@ -149,6 +167,28 @@ def test_ab_distribution_if_enabled(client, samples, routing_mode, request):
         assert len(seen) == 1, f"Non-sticky assignment for unit_id={unit}: got {seen}"
 
 
+def test_price_cache_hit_and_clear(client, samples):
+    """
+    A repeated quote is served from the gateway's price cache, and
+    POST /cache/clear drops it so the next request reaches the model again.
+    """
+    payload = samples["even_birthdate_model_a"]
+
+    def cache_hit():
+        r, body = _post_price(client, payload)
+        assert r.status_code == 200, f"Price request failed: {r.text}"
+        return (body.get("gateway_metadata") or {}).get("cache_hit")
+
+    assert client.post("/cache/clear").status_code == 200
+    assert cache_hit() is False
+    assert cache_hit() is True, "Repeated request was not served from the cache"
+
+    r = client.post("/cache/clear")
+    assert r.status_code == 200
+    assert r.json()["entries_cleared"] >= 1
+    assert cache_hit() is False, "Request after /cache/clear was still a cache hit"
+
+
 def test_metrics_endpoint_exposes_prometheus_counters(client):
     r = client.get("/metrics", follow_redirects=True)
     assert r.status_code == 200